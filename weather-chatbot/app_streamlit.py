@@ -2,12 +2,12 @@ from __future__ import annotations
 
 import asyncio
 import json
-from typing import Any, Dict, List
+from typing import TYPE_CHECKING, Any, Dict, List
 
 import streamlit as st
-from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
 
-from core.agent.agent import build_agent
+if TYPE_CHECKING:
+    from langchain_core.messages import BaseMessage
 
 # ========= Helpers UI =========
 
@@ -353,6 +353,8 @@ def _render_details(details: List[Dict[str, Any]]) -> None:
 
 
 def _extract_tool_details(new_msgs: List[BaseMessage]) -> List[Dict[str, Any]]:
+    from langchain_core.messages import AIMessage, ToolMessage
+
     details: List[Dict[str, Any]] = []
     for m in new_msgs:
         if isinstance(m, AIMessage):
@@ -392,7 +394,18 @@ def _render_turns() -> None:
 # ========= Streaming =========
 
 
+def _get_agent():
+    """Build the agent on first use so the page renders before LangChain loads."""
+    if "agent" not in st.session_state:
+        from core.agent import build_agent
+
+        st.session_state.agent = build_agent()
+    return st.session_state.agent
+
+
 async def stream_agent_reply(user_input: str) -> None:
+    from langchain_core.messages import HumanMessage
+
     st.session_state.chat_history.append(HumanMessage(content=user_input))
 
     live_block = st.empty()
@@ -406,7 +419,7 @@ async def stream_agent_reply(user_input: str) -> None:
                 details_placeholder = st.empty()
                 partial = ""
 
-                async with st.session_state.agent.run_stream(
+                async with _get_agent().run_stream(
                     user_input,
                     message_history=st.session_state.chat_history[:-1],
                 ) as result:
@@ -469,8 +482,6 @@ async def main():
             st.session_state.ui_turns = []
             st.rerun()
 
-    if "agent" not in st.session_state:
-        st.session_state.agent = build_agent()
     if "chat_history" not in st.session_state:
         st.session_state.chat_history: List[BaseMessage] = []
     if "ui_turns" not in st.session_state:
@@ -0,0 +1,150 @@
+"""Throughput of the tool layer across processes sharing the SQLite weather cache.
+
+Run from the inner ``weather-chatbot`` folder::
+
+    python benchmarks/cache_throughput.py --workers 1 2 4
+
+Each worker process imports ``core.agent.tools`` configured with the SQLite cache
+backend and serves ``forecast_weather`` calls, so every request goes through the
+real cache lookup, payload decoding and normalization. Only the HTTP request to
+WeatherAPI is replaced by a stub that sleeps for ``--fetch-latency``. The shared
+cache is warmed first so each run measures steady-state serving.
+
+This is a benchmark of the tool and cache layer, not of a full deployment: the
+router, Streamlit and the LLM are not involved, and LLM generation dominates a
+real turn. The report shows requests per second for each worker count and the
+scaling efficiency relative to a single worker; scaling is bounded by the
+number of CPU cores.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+APP_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_DIR))
+
+
+def _fake_forecast(city: str, days: int) -> Dict[str, Any]:
+    return {
+        "location": {"name": city, "region": "Region", "country": "Country"},
+        "forecast": {
+            "forecastday": [
+                {
+                    "date": f"2026-01-{d + 1:02d}",
+                    "day": {
+                        "avgtemp_c": 12.5 + d,
+                        "avghumidity": 60 + d,
+                        "maxwind_kph": 18.0,
+                        "air_quality": {"pm2_5": 8.1, "pm10": 12.4, "o3": 55.0},
+                    },
+                    "hour": [
+                        {"time": f"{h:02d}:00", "temp_c": 10.0 + h / 4, "humidity": 70}
+                        for h in range(24)
+                    ],
+                }
+                for d in range(days)
+            ]
+        },
+    }
+
+
+def _load_tools(fetch_latency_s: float):
+    """Import the tool layer with the WeatherAPI request stubbed out."""
+    from core.agent import tools
+
+    def fake_fetch(endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        time.sleep(fetch_latency_s)
+        return _fake_forecast(params["q"], params.get("days", 1))
+
+    tools._fetch_weather = fake_fetch
+    return tools
+
+
+def _worker(
+    index: int,
+    cities: List[str],
+    duration_s: float,
+    fetch_latency_s: float,
+    start: Any,
+    results: Any,
+) -> None:
+    tools = _load_tools(fetch_latency_s)
+    rng = random.Random(index)
+    weights = [1 / (rank + 1) for rank in range(len(cities))]
+
+    start.wait()
+    deadline = time.perf_counter() + duration_s
+    served = 0
+    while time.perf_counter() < deadline:
+        tools.forecast_weather(rng.choices(cities, weights)[0], days=3)
+        served += 1
+    results.put((served, tools.WEATHER_CACHE.stats()))
+
+
+def run(workers: int, args: argparse.Namespace, cities: List[str]) -> Dict[str, Any]:
+    ctx = mp.get_context("spawn")
+    start = ctx.Barrier(workers)
+    results = ctx.Queue()
+    procs = [
+        ctx.Process(
+            target=_worker,
+            args=(i, cities, args.duration, args.fetch_latency, start, results),
+        )
+        for i in range(workers)
+    ]
+    for proc in procs:
+        proc.start()
+    collected = [results.get() for _ in procs]
+    for proc in procs:
+        proc.join()
+
+    served = sum(count for count, _ in collected)
+    return {
+        "workers": workers,
+        "requests": served,
+        "rps": served / args.duration,
+        "misses": sum(stats["misses"] for _, stats in collected),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--cities", type=int, default=200)
+    parser.add_argument("--fetch-latency", type=float, default=0.05)
+    args = parser.parse_args()
+
+    cities = [f"City{i}" for i in range(args.cities)]
+    baseline = None
+    with tempfile.TemporaryDirectory() as tmp:
+        # Set before importing the tools so workers inherit the shared backend.
+        os.environ["WEATHER_CACHE_BACKEND"] = "sqlite"
+        os.environ["WEATHER_CACHE_PATH"] = str(Path(tmp) / "weather.sqlite3")
+        os.environ["WEATHER_CACHE_TTL_S"] = "3600"
+
+        tools = _load_tools(0.0)
+        for city in cities:
+            tools.forecast_weather(city, days=3)
+
+        print(json.dumps({"cpu_count": os.cpu_count()}))
+        for workers in args.workers:
+            report = run(workers, args, cities)
+            if baseline is None:
+                baseline = report["rps"] / workers
+            report["efficiency"] = report["rps"] / (baseline * workers)
+            print(json.dumps(report))
+
+
+if __name__ == "__main__":
+    main()
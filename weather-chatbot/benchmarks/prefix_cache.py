@@ -0,0 +1,58 @@
+"""Prefill time for step 1 vs step 2 of the agent's tool turns.
+
+Run from the inner ``weather-chatbot`` folder with Ollama serving ``LLM_MODEL``::
+
+    python benchmarks/prefix_cache.py
+    python benchmarks/prefix_cache.py "Forecast for Bilbao" "Weather in Lisbon?"
+
+The prompts are played as one conversation through
+``build_agent(prefix_cache=True)``, which talks to Ollama's native API, and the
+agent's own ``prefix_stats.summary()`` is printed. Step 1 is the tool-call
+decision and step 2 the answer after the tool result, so step 2 only differs
+from step 1 by its appended tail. A clearly shorter ``avg_prefill_s`` on step 2
+means Ollama reused the KV cache for the shared prefix.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+APP_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(APP_DIR))
+
+from langchain_core.messages import HumanMessage  # noqa: E402
+
+from core.agent.agent import build_agent  # noqa: E402
+
+DEFAULT_PROMPTS = [
+    "What is the current weather in Madrid?",
+    "Give me the 3 day forecast for Barcelona.",
+    "How is the air quality in Valencia right now?",
+]
+
+
+async def _run_agent(prompts: List[str]) -> Dict[int, Dict[str, Any]]:
+    agent = build_agent(prefix_cache=True, prefetch=False)
+    history = []
+    for prompt in prompts:
+        new_messages, _ = await agent._run(prompt, history)
+        history.append(HumanMessage(content=prompt))
+        history.extend(new_messages)
+    return agent.prefix_stats.summary()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("prompts", nargs="*", default=DEFAULT_PROMPTS)
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(_run_agent(args.prompts))))
+
+
+if __name__ == "__main__":
+    main()
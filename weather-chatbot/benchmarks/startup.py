@@ -0,0 +1,132 @@
+"""Cold-start benchmark: import times and time to first response.
+
+Run from the inner ``weather-chatbot`` folder::
+
+    python benchmarks/startup.py
+    python benchmarks/startup.py --prompt "What is the weather in Madrid?" --output startup.jsonl
+
+Every measurement runs in a fresh interpreter so module caches do not hide the
+real cold-start cost. Appending results to a JSONL file with ``--output`` lets
+releases be compared over time.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from importlib import metadata
+from pathlib import Path
+from typing import Any, Dict, List
+
+APP_DIR = Path(__file__).resolve().parent.parent
+
+IMPORT_TARGETS = {
+    "core.agent.tools": "import core.agent.tools",
+    "core.agent": "import core.agent",
+    "core.agent.agent": "import core.agent.agent",
+}
+
+_IMPORT_SNIPPET = """
+import time
+t0 = time.perf_counter()
+{statement}
+print(time.perf_counter() - t0)
+"""
+
+_FIRST_RESPONSE_SNIPPET = """
+import asyncio, json, time
+t0 = time.perf_counter()
+from core.agent import build_agent
+t_import = time.perf_counter()
+agent = build_agent()
+t_build = time.perf_counter()
+asyncio.run(agent._run({prompt!r}, []))
+t_done = time.perf_counter()
+print(json.dumps({{
+    "import_s": t_import - t0,
+    "build_s": t_build - t_import,
+    "first_response_s": t_done - t_build,
+    "total_s": t_done - t0,
+}}))
+"""
+
+
+def _run_child(code: str) -> str:
+    completed = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=APP_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return completed.stdout.strip().splitlines()[-1]
+
+
+def _child_error(exc: subprocess.CalledProcessError) -> str:
+    lines = (exc.stderr or "").strip().splitlines()
+    return lines[-1] if lines else f"exit status {exc.returncode}"
+
+
+def measure_imports(repeat: int) -> Dict[str, Dict[str, Any]]:
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, statement in IMPORT_TARGETS.items():
+        samples: List[float] = []
+        try:
+            for _ in range(repeat):
+                samples.append(
+                    float(_run_child(_IMPORT_SNIPPET.format(statement=statement)))
+                )
+        except subprocess.CalledProcessError as exc:
+            results[name] = {"error": _child_error(exc)}
+            continue
+        results[name] = {"median_s": statistics.median(samples), "min_s": min(samples)}
+    return results
+
+
+def measure_first_response(prompt: str) -> Dict[str, Any]:
+    try:
+        return json.loads(_run_child(_FIRST_RESPONSE_SNIPPET.format(prompt=prompt)))
+    except subprocess.CalledProcessError as exc:
+        return {"error": _child_error(exc)}
+
+
+def _package_version() -> str:
+    try:
+        return metadata.version("weather-chatbot")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="runs per import target")
+    parser.add_argument(
+        "--prompt",
+        default=None,
+        help="also measure time to first response (needs the LLM and WeatherAPI)",
+    )
+    parser.add_argument("--output", type=Path, default=None, help="append JSONL here")
+    args = parser.parse_args()
+
+    report: Dict[str, Any] = {
+        "version": _package_version(),
+        "python": sys.version.split()[0],
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "imports": measure_imports(args.repeat),
+    }
+    if args.prompt:
+        report["first_response"] = measure_first_response(args.prompt)
+
+    line = json.dumps(report)
+    print(line)
+    if args.output:
+        with args.output.open("a", encoding="utf-8") as fh:
+            fh.write(line + "\n")
+
+
+if __name__ == "__main__":
+    main()
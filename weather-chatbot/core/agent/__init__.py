@@ -1,3 +1,17 @@
-from core.agent.agent import build_agent
+from __future__ import annotations
 
-__all__ = ["build_agent"]
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from core.agent.agent import WeatherAgent, build_agent
+
+__all__ = ["WeatherAgent", "build_agent"]
+
+
+def __getattr__(name: str) -> Any:
+    # LangChain and LangGraph are only imported on first agent use.
+    if name in __all__:
+        from core.agent import agent
+
+        return getattr(agent, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,16 +1,37 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Annotated, List, TypedDict
+import time
+from pathlib import Path
+from typing import Annotated, List, Optional, TypedDict
 
+from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
 from langchain_openai import ChatOpenAI
 from langgraph.graph import StateGraph
 from langgraph.graph.message import add_messages
 from langgraph.prebuilt import ToolNode, tools_condition
 
+from core.agent.prefetch import WeatherPrefetcher
+from core.agent.prefix import (
+    PrefixCacheStats,
+    build_stable_prefix,
+    ollama_native_url,
+    turn_step,
+)
 from core.agent.tools import WEATHER_TOOLS
-from core.config import LLM_API_KEY, LLM_MODEL, LLM_TEMPERATURE, OLLAMA_BASE_URL
+from core.digest import DigestStore
+from core.config import (
+    DIGEST_STORE_PATH,
+    LLM_API_KEY,
+    LLM_MODEL,
+    LLM_PREFIX_CACHE,
+    LLM_TEMPERATURE,
+    OLLAMA_BASE_URL,
+    OLLAMA_KEEP_ALIVE,
+    WEATHER_CACHE_TTL_S,
+    WEATHER_PREFETCH,
+)
 
 SYSTEM_PROMPT = (
     "You are a weather assistant. You only answer weather-related questions about "
@@ -28,8 +49,26 @@ class AgentState(TypedDict):
 
 
 class WeatherAgent:
-    def __init__(self, graph) -> None:
+    def __init__(
+        self,
+        graph,
+        prefix_stats: Optional[PrefixCacheStats] = None,
+        prefetcher: Optional[WeatherPrefetcher] = None,
+        digest_path: Optional[str] = None,
+    ) -> None:
         self._graph = graph
+        self._prefix_stats = prefix_stats
+        self._prefetcher = prefetcher
+        self._digest_path = digest_path
+        self._digests: Optional[DigestStore] = None
+
+    @property
+    def prefix_stats(self) -> Optional[PrefixCacheStats]:
+        return self._prefix_stats
+
+    @property
+    def prefetcher(self) -> Optional[WeatherPrefetcher]:
+        return self._prefetcher
 
     def run_stream(self, user_input: str, message_history: List[BaseMessage]):
         return _AgentRunStream(self, user_input, message_history)
@@ -37,10 +76,21 @@ class WeatherAgent:
     async def _run(
         self, user_input: str, message_history: List[BaseMessage]
     ) -> tuple[List[BaseMessage], str]:
+        digest = await asyncio.to_thread(self._answer_from_digest, user_input)
+        if digest:
+            return [AIMessage(content=digest)], digest
+
         history = list(message_history) if message_history else []
         messages = history + [HumanMessage(content=user_input)]
 
-        result = await asyncio.to_thread(self._graph.invoke, {"messages": messages})
+        prefetched = self._prefetcher.start(user_input) if self._prefetcher else []
+        try:
+            result = await asyncio.to_thread(
+                self._graph.invoke, {"messages": messages}
+            )
+        finally:
+            if prefetched:
+                self._prefetcher.settle(prefetched)
         all_messages = result.get("messages", [])
 
         new_messages = all_messages[len(history) + 1 :]
@@ -52,6 +102,15 @@ class WeatherAgent:
 
         return new_messages, final_text
 
+    def _answer_from_digest(self, user_input: str) -> Optional[str]:
+        # The store is opened on first use after the daily pipeline creates it,
+        # so agents built before the first run still start serving digests.
+        if self._digests is None:
+            if not self._digest_path or not Path(self._digest_path).exists():
+                return None
+            self._digests = DigestStore(self._digest_path)
+        return self._digests.answer(user_input)
+
 
 class _AgentRunStream:
     def __init__(
@@ -90,7 +149,19 @@ def _iter_text_chunks(text: str, chunk_size: int = 48):
         yield text[i : i + chunk_size]
 
 
-def _build_model() -> ChatOpenAI:
+def _build_model(prefix_cache: bool = False) -> BaseChatModel:
+    if prefix_cache:
+        # The native Ollama API honours keep_alive, so the model and its KV cache
+        # stay loaded between turns, and it reports prompt_eval_duration.
+        from langchain_ollama import ChatOllama
+
+        return ChatOllama(
+            model=LLM_MODEL,
+            temperature=LLM_TEMPERATURE,
+            base_url=ollama_native_url(OLLAMA_BASE_URL),
+            keep_alive=OLLAMA_KEEP_ALIVE,
+        )
+
     return ChatOpenAI(
         model=LLM_MODEL,
         temperature=LLM_TEMPERATURE,
@@ -99,14 +170,33 @@ def _build_model() -> ChatOpenAI:
     )
 
 
-def build_agent() -> WeatherAgent:
-    llm = _build_model()
-    llm_with_tools = llm.bind_tools(WEATHER_TOOLS)
+def build_agent(
+    prefix_cache: bool = LLM_PREFIX_CACHE, prefetch: bool = WEATHER_PREFETCH
+) -> WeatherAgent:
+    llm = _build_model(prefix_cache)
+    prefix_stats: Optional[PrefixCacheStats] = None
+
+    if prefix_cache:
+        prefix = build_stable_prefix(SYSTEM_PROMPT, WEATHER_TOOLS)
+        prefix_stats = PrefixCacheStats()
+        llm_with_tools = llm.bind_tools(list(prefix.tool_schemas))
 
-    def assistant(state: AgentState):
-        messages = [SystemMessage(content=SYSTEM_PROMPT)] + state["messages"]
-        response = llm_with_tools.invoke(messages)
-        return {"messages": [response]}
+        def assistant(state: AgentState):
+            history = state["messages"]
+            started = time.perf_counter()
+            response = llm_with_tools.invoke([prefix.system_message, *history])
+            prefix_stats.record(
+                turn_step(history), time.perf_counter() - started, response
+            )
+            return {"messages": [response]}
+
+    else:
+        llm_with_tools = llm.bind_tools(WEATHER_TOOLS)
+
+        def assistant(state: AgentState):
+            messages = [SystemMessage(content=SYSTEM_PROMPT)] + state["messages"]
+            response = llm_with_tools.invoke(messages)
+            return {"messages": [response]}
 
     graph = StateGraph(AgentState)
     graph.add_node("assistant", assistant)
@@ -115,4 +205,11 @@ def build_agent() -> WeatherAgent:
     graph.add_edge("tools", "assistant")
     graph.set_entry_point("assistant")
 
-    return WeatherAgent(graph.compile())
+    # Prefetching only pays off when the tools read through the cache.
+    prefetcher = WeatherPrefetcher() if prefetch and WEATHER_CACHE_TTL_S > 0 else None
+    return WeatherAgent(
+        graph.compile(),
+        prefix_stats=prefix_stats,
+        prefetcher=prefetcher,
+        digest_path=DIGEST_STORE_PATH,
+    )
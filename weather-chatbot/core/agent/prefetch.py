@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import re
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from core.agent.tools import WEATHER_CACHE, warm_weather_cache, weather_target
+from core.cache import CacheKey, weather_cache_key
+
+DEFAULT_FORECAST_DAYS = 3
+MAX_PREFETCH_CITIES = 2
+
+_CITY_RE = re.compile(
+    r"\b(?:in|for|at|en|para|de)\s+"
+    r"([A-ZÁÉÍÓÚÑ][\w'’.-]*(?:\s+(?:de\s+|del\s+)?[A-ZÁÉÍÓÚÑ][\w'’.-]*)*)"
+)
+_WEATHER_RE = re.compile(
+    r"\b(?:weather|forecast|temperature|temp|rain\w*|snow\w*|wind\w*|humid\w*|"
+    r"sunny|cloudy|storm\w*|air quality|aqi|tiempo|clima|pron[oó]stico|"
+    r"previsi[oó]n|lluvi\w*|llover\w*|llueve|nieve|nevar\w*|temperatura|"
+    r"viento|humedad|calidad del aire|calor|fr[ií]o)\b",
+    re.IGNORECASE,
+)
+_DAYS_RE = re.compile(r"\b(\d{1,2})\s*[- ]?\s*(?:days?|d[ií]as?)\b", re.IGNORECASE)
+_FORECAST_RE = re.compile(
+    r"\b(?:forecast|tomorrow|week|weekend|next|pron[oó]stico|previsi[oó]n|"
+    r"ma[nñ]ana|semana|pr[oó]ximos?)\b",
+    re.IGNORECASE,
+)
+
+
+@dataclass(frozen=True)
+class PrefetchGuess:
+    city: str
+    days: Optional[int]
+
+
+def guess_weather_requests(text: str) -> List[PrefetchGuess]:
+    """Cheaply guess which tool calls the model is about to make.
+
+    Messages without a weather keyword return no guesses, so off-topic
+    questions never spend WeatherAPI quota.
+    """
+    if not _WEATHER_RE.search(text):
+        return []
+
+    cities: List[str] = []
+    for match in _CITY_RE.finditer(text):
+        city = match.group(1).rstrip(".")
+        if city not in cities:
+            cities.append(city)
+        if len(cities) >= MAX_PREFETCH_CITIES:
+            break
+
+    days: Optional[int] = None
+    days_match = _DAYS_RE.search(text)
+    if days_match:
+        days = int(days_match.group(1))
+    elif _FORECAST_RE.search(text):
+        days = DEFAULT_FORECAST_DAYS
+
+    return [PrefetchGuess(city=city, days=days) for city in cities]
+
+
+class WeatherPrefetcher:
+    """Warms the weather cache concurrently with the first LLM call."""
+
+    def __init__(self, max_workers: int = 4) -> None:
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="weather-prefetch"
+        )
+
+    def start(self, user_input: str) -> List[Tuple[CacheKey, Future]]:
+        started: List[Tuple[CacheKey, Future]] = []
+        for guess in guess_weather_requests(user_input):
+            key = weather_cache_key(*weather_target(guess.city, guess.days))
+            if WEATHER_CACHE.begin_speculative(key):
+                future = self._executor.submit(warm_weather_cache, guess.city, guess.days)
+                started.append((key, future))
+        return started
+
+    def settle(self, started: List[Tuple[CacheKey, Future]]) -> int:
+        """Cancel prefetches that have not run yet and count unused ones as wasted."""
+        for _, future in started:
+            future.cancel()
+        return WEATHER_CACHE.settle_speculative(key for key, _ in started)
+
+    def stats(self) -> dict:
+        stats = WEATHER_CACHE.stats()
+        return {
+            "started": stats["prefetch_started"],
+            "used": stats["prefetch_used"],
+            "wasted": stats["prefetch_wasted"],
+        }
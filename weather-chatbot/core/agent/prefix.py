@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import json
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+
+@dataclass(frozen=True)
+class StablePrefix:
+    """System prompt and tool schemas serialized once, reused byte-for-byte."""
+
+    system_message: SystemMessage
+    tool_schemas: tuple
+
+
+@dataclass(frozen=True)
+class StepTiming:
+    step: int
+    latency_s: float
+    prefill_s: Optional[float]
+    input_tokens: Optional[int]
+    cached_tokens: Optional[int]
+
+
+def build_stable_prefix(system_prompt: str, tools: Sequence[Any]) -> StablePrefix:
+    schemas = [convert_to_openai_tool(tool) for tool in tools]
+    # Round-trip through sorted JSON so key order is fixed for every request.
+    canonical = json.loads(json.dumps(schemas, sort_keys=True, ensure_ascii=False))
+    return StablePrefix(
+        system_message=SystemMessage(content=system_prompt),
+        tool_schemas=tuple(canonical),
+    )
+
+
+def turn_step(messages: List[BaseMessage]) -> int:
+    """1-based index of the assistant step within the current user turn."""
+    step = 1
+    for msg in reversed(messages):
+        if isinstance(msg, HumanMessage):
+            break
+        if isinstance(msg, AIMessage):
+            step += 1
+    return step
+
+
+class PrefixCacheStats:
+    """Per-step timings of the agent's own LLM calls.
+
+    In prefix-cache mode the agent talks to Ollama's native API, which reports
+    ``prompt_eval_duration`` (prefill) and ``prompt_eval_count`` (prompt tokens
+    actually evaluated). Ollama does not report cached tokens, so
+    ``cache_reuse`` stays ``None`` and reuse shows up as a shorter step-2
+    prefill instead.
+    """
+
+    def __init__(self, max_records: int = 512) -> None:
+        self._records: deque[StepTiming] = deque(maxlen=max_records)
+        self._lock = threading.Lock()
+
+    def record(self, step: int, latency_s: float, response: AIMessage) -> None:
+        usage = getattr(response, "usage_metadata", None) or {}
+        details = usage.get("input_token_details") or {}
+        metadata = getattr(response, "response_metadata", None) or {}
+        prefill_ns = metadata.get("prompt_eval_duration")
+
+        timing = StepTiming(
+            step=step,
+            latency_s=latency_s,
+            prefill_s=prefill_ns / 1e9 if prefill_ns is not None else None,
+            input_tokens=usage.get("input_tokens"),
+            cached_tokens=details.get("cache_read"),
+        )
+        with self._lock:
+            self._records.append(timing)
+
+    def records(self) -> List[StepTiming]:
+        with self._lock:
+            return list(self._records)
+
+    def summary(self) -> Dict[int, Dict[str, Any]]:
+        """Aggregate latency, prefill and cache reuse per assistant step."""
+        by_step: Dict[int, List[StepTiming]] = {}
+        for timing in self.records():
+            by_step.setdefault(timing.step, []).append(timing)
+
+        result: Dict[int, Dict[str, Any]] = {}
+        for step, items in sorted(by_step.items()):
+            prefills = [t.prefill_s for t in items if t.prefill_s is not None]
+            # Only steps that reported cached tokens say anything about reuse.
+            measured = [t for t in items if t.cached_tokens is not None and t.input_tokens]
+            input_tokens = sum(t.input_tokens for t in measured)
+            cached_tokens = sum(t.cached_tokens for t in measured)
+            result[step] = {
+                "count": len(items),
+                "avg_latency_s": sum(t.latency_s for t in items) / len(items),
+                "avg_prefill_s": sum(prefills) / len(prefills) if prefills else None,
+                "cache_reuse": cached_tokens / input_tokens if measured else None,
+            }
+        return result
+
+
+def ollama_native_url(base_url: str) -> str:
+    """Map the OpenAI-compatible base URL (``.../v1``) to the native API root."""
+    base = base_url.rstrip("/")
+    return base[: -len("/v1")] if base.endswith("/v1") else base
+
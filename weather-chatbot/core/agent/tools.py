@@ -1,22 +1,44 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+from functools import lru_cache
+from typing import Any, Dict, Tuple
 
 import requests
 from decouple import config
-from langchain_core.tools import StructuredTool
 
+from core.cache import WeatherCache, make_cache_backend, weather_cache_key
+from core.config import WEATHER_CACHE_BACKEND, WEATHER_CACHE_PATH, WEATHER_CACHE_TTL_S
 from core.models import CurrentWeatherInput, ForecastWeatherInput
 
 WEATHER_API_BASE = "http://api.weatherapi.com/v1"
 DEFAULT_TIMEOUT_S = 10
+MAX_FORECAST_DAYS = 10
+
+WEATHER_CACHE = WeatherCache(
+    ttl_s=WEATHER_CACHE_TTL_S,
+    backend=make_cache_backend(WEATHER_CACHE_BACKEND, WEATHER_CACHE_PATH),
+)
+
+_LAZY_TOOLS = ("current_weather_tool", "forecast_weather_tool", "WEATHER_TOOLS")
 
 
 def _get_api_key() -> str | None:
     return config("WEATHER_API_KEY", default=None)
 
 
-def _request_weather(endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
+def _request_weather(
+    endpoint: str, params: Dict[str, Any], speculative: bool = False
+) -> Dict[str, Any]:
+    if WEATHER_CACHE_TTL_S <= 0:
+        return _fetch_weather(endpoint, params)
+    return WEATHER_CACHE.get_or_fetch(
+        weather_cache_key(endpoint, params),
+        lambda: _fetch_weather(endpoint, params),
+        speculative=speculative,
+    )
+
+
+def _fetch_weather(endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
     api_key = _get_api_key()
     if not api_key:
         return {"error": "WEATHER_API_KEY is not set in .env"}
@@ -43,6 +65,22 @@ def _request_weather(endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
     return data
 
 
+def _forecast_params(city: str, days: int) -> Dict[str, Any]:
+    return {"q": city, "days": max(1, min(int(days), MAX_FORECAST_DAYS))}
+
+
+def weather_target(city: str, days: int | None = None) -> Tuple[str, Dict[str, Any]]:
+    """Endpoint and params the tools use for current (days=None) or forecast data."""
+    if days is None:
+        return "current", {"q": city}
+    return "forecast", _forecast_params(city, days)
+
+
+def warm_weather_cache(city: str, days: int | None = None) -> Dict[str, Any]:
+    endpoint, params = weather_target(city, days)
+    return _request_weather(endpoint, params, speculative=True)
+
+
 def current_weather(city: str) -> Dict[str, Any]:
     data = _request_weather("current", {"q": city})
     if "error" in data:
@@ -65,8 +103,9 @@ def current_weather(city: str) -> Dict[str, Any]:
 
 
 def forecast_weather(city: str, days: int = 3) -> Dict[str, Any]:
-    safe_days = max(1, min(int(days), 10))
-    data = _request_weather("forecast", {"q": city, "days": safe_days})
+    params = _forecast_params(city, days)
+    safe_days = params["days"]
+    data = _request_weather("forecast", params)
     if "error" in data:
         return data
 
@@ -89,31 +128,48 @@ def forecast_weather(city: str, days: int = 3) -> Dict[str, Any]:
             "name": location.get("name"),
             "region": location.get("region"),
             "country": location.get("country"),
+            "tz_id": location.get("tz_id"),
         },
         "days": safe_days,
         "forecast": forecast_days,
     }
 
 
-current_weather_tool = StructuredTool.from_function(
-    current_weather,
-    name="current_weather",
-    description=(
-        "Get current weather and air quality for a city. "
-        "Input: city name. Output includes temperature_c, humidity, wind_kph, air_quality."
-    ),
-    args_schema=CurrentWeatherInput,
-)
+@lru_cache(maxsize=None)
+def _build_tools() -> Dict[str, Any]:
+    from langchain_core.tools import StructuredTool
+
+    current_weather_tool = StructuredTool.from_function(
+        current_weather,
+        name="current_weather",
+        description=(
+            "Get current weather and air quality for a city. "
+            "Input: city name. Output includes temperature_c, humidity, wind_kph, air_quality."
+        ),
+        args_schema=CurrentWeatherInput,
+    )
+
+    forecast_weather_tool = StructuredTool.from_function(
+        forecast_weather,
+        name="forecast_weather",
+        description=(
+            "Get forecast weather and air quality for a city over a number of days. "
+            "Input: city name and days (default 3). Output includes temperature_c, humidity, "
+            "wind_kph, air_quality for each day."
+        ),
+        args_schema=ForecastWeatherInput,
+    )
+
+    return {
+        "current_weather_tool": current_weather_tool,
+        "forecast_weather_tool": forecast_weather_tool,
+        "WEATHER_TOOLS": [current_weather_tool, forecast_weather_tool],
+    }
 
-forecast_weather_tool = StructuredTool.from_function(
-    forecast_weather,
-    name="forecast_weather",
-    description=(
-        "Get forecast weather and air quality for a city over a number of days. "
-        "Input: city name and days (default 3). Output includes temperature_c, humidity, "
-        "wind_kph, air_quality for each day."
-    ),
-    args_schema=ForecastWeatherInput,
-)
 
-WEATHER_TOOLS = [current_weather_tool, forecast_weather_tool]
+def __getattr__(name: str) -> Any:
+    # The LangChain tool wrappers are built on first access so the plain
+    # weather functions above can be imported without LangChain installed.
+    if name in _LAZY_TOOLS:
+        return _build_tools()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Protocol, Tuple
+
+CacheKey = Tuple[Hashable, ...]
+
+
+def weather_cache_key(endpoint: str, params: Dict[str, Any]) -> CacheKey:
+    normalized = []
+    for name, value in sorted(params.items()):
+        if isinstance(value, str):
+            value = " ".join(value.split()).casefold()
+        normalized.append((name, value))
+    return (endpoint, *normalized)
+
+
+class CacheBackend(Protocol):
+    def get(self, key: CacheKey) -> Optional[Dict[str, Any]]: ...
+
+    def set(self, key: CacheKey, data: Dict[str, Any], ttl_s: float) -> None: ...
+
+    def clear(self) -> None: ...
+
+
+class MemoryCacheBackend:
+    """Process-local storage; the default for a single Streamlit process."""
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        self._max_entries = max_entries
+        self._entries: Dict[CacheKey, Tuple[float, Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[1]
+
+    def set(self, key: CacheKey, data: Dict[str, Any], ttl_s: float) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if len(self._entries) >= self._max_entries:
+                for stale in [k for k, (exp, _) in self._entries.items() if exp <= now]:
+                    del self._entries[stale]
+            while len(self._entries) >= self._max_entries:
+                del self._entries[next(iter(self._entries))]
+            self._entries[key] = (now + ttl_s, data)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def encode_payload(data: Dict[str, Any]) -> bytes:
+    raw = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+    return zlib.compress(raw.encode("utf-8"), 1)
+
+
+def decode_payload(blob: bytes) -> Dict[str, Any]:
+    return json.loads(zlib.decompress(blob).decode("utf-8"))
+
+
+class SQLiteCacheBackend:
+    """Cache shared by several worker processes through one SQLite file.
+
+    The database runs in WAL mode so readers in other processes are never
+    blocked by a writer. Payloads are stored as zlib-compressed compact JSON.
+    """
+
+    _PRUNE_EVERY = 256
+
+    def __init__(self, path: str | Path) -> None:
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS weather_cache ("
+            "key TEXT PRIMARY KEY, expires REAL NOT NULL, payload BLOB NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS weather_cache_expires ON weather_cache(expires)"
+        )
+        conn.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self._path, timeout=5.0)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _encode_key(key: CacheKey) -> str:
+        return json.dumps(key, separators=(",", ":"), ensure_ascii=False)
+
+    def get(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        try:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT payload FROM weather_cache WHERE key = ? AND expires > ?",
+                    (self._encode_key(key), time.time()),
+                )
+                .fetchone()
+            )
+            return decode_payload(row[0]) if row else None
+        except (sqlite3.OperationalError, zlib.error, ValueError):
+            # A busy database or a corrupt row is a miss; the cache is best-effort.
+            return None
+
+    def set(self, key: CacheKey, data: Dict[str, Any], ttl_s: float) -> None:
+        now = time.time()
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO weather_cache (key, expires, payload) "
+                    "VALUES (?, ?, ?)",
+                    (self._encode_key(key), now + ttl_s, encode_payload(data)),
+                )
+                with self._writes_lock:
+                    self._writes += 1
+                    prune = self._writes % self._PRUNE_EVERY == 0
+                if prune:
+                    conn.execute("DELETE FROM weather_cache WHERE expires <= ?", (now,))
+        except sqlite3.OperationalError:
+            pass
+
+    def clear(self) -> None:
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM weather_cache")
+
+
+def make_cache_backend(kind: str, path: str | Path | None = None) -> CacheBackend:
+    if kind == "memory":
+        return MemoryCacheBackend()
+    if kind == "sqlite":
+        if path is None:
+            raise ValueError("The sqlite cache backend requires a path")
+        return SQLiteCacheBackend(path)
+    raise ValueError(f"Unknown weather cache backend: {kind!r}")
+
+
+class WeatherCache:
+    """Thread-safe TTL cache for weather API payloads.
+
+    Concurrent lookups for the same key share a single in-flight fetch. Entries
+    warmed speculatively are tracked so unused prefetches can be accounted for.
+    Storage is delegated to a backend, in-process memory by default.
+    """
+
+    def __init__(self, ttl_s: float = 600, backend: CacheBackend | None = None) -> None:
+        self._ttl_s = ttl_s
+        self._backend = backend if backend is not None else MemoryCacheBackend()
+        self._inflight: Dict[CacheKey, Future] = {}
+        self._speculative: set[CacheKey] = set()
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "prefetch_started": 0,
+            "prefetch_used": 0,
+            "prefetch_wasted": 0,
+        }
+
+    def begin_speculative(self, key: CacheKey) -> bool:
+        """Register a prefetch for ``key`` before it is scheduled.
+
+        Returns ``False`` when the data is already cached or being fetched, in
+        which case there is nothing to prefetch. Registering up front means
+        :meth:`settle_speculative` sees the key even if the prefetch task has
+        not started yet.
+        """
+        if self._backend.get(key) is not None:
+            return False
+        with self._lock:
+            if key in self._inflight or key in self._speculative:
+                return False
+            self._speculative.add(key)
+            self._stats["prefetch_started"] += 1
+        return True
+
+    def get_or_fetch(
+        self,
+        key: CacheKey,
+        fetch: Callable[[], Dict[str, Any]],
+        speculative: bool = False,
+    ) -> Dict[str, Any]:
+        cached = self._backend.get(key)
+        if cached is not None:
+            with self._lock:
+                self._note_hit(key, speculative)
+            return cached
+
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+            else:
+                self._note_hit(key, speculative)
+
+        if not owner:
+            return future.result()
+
+        try:
+            # Another thread may have stored the data between the first lookup
+            # and registering the fetch. Check again outside the lock so a slow
+            # backend does not serialize misses for unrelated keys.
+            cached = self._backend.get(key)
+            if cached is None:
+                if not speculative:
+                    with self._lock:
+                        self._stats["misses"] += 1
+                data = fetch()
+        except BaseException as exc:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(exc)
+            raise
+
+        if cached is not None:
+            with self._lock:
+                self._inflight.pop(key, None)
+                self._note_hit(key, speculative)
+            future.set_result(cached)
+            return cached
+
+        try:
+            if "error" not in data:
+                self._backend.set(key, data, self._ttl_s)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_result(data)
+        return data
+
+    def settle_speculative(self, keys: Iterable[CacheKey]) -> int:
+        """Count prefetched keys that were never consumed as wasted."""
+        wasted = 0
+        with self._lock:
+            for key in keys:
+                if key in self._speculative:
+                    self._speculative.discard(key)
+                    wasted += 1
+            self._stats["prefetch_wasted"] += wasted
+        return wasted
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+    def clear(self) -> None:
+        self._backend.clear()
+        with self._lock:
+            self._speculative.clear()
+
+    def _note_hit(self, key: CacheKey, speculative: bool) -> None:
+        if speculative:
+            return
+        self._stats["hits"] += 1
+        if key in self._speculative:
+            self._speculative.discard(key)
+            self._stats["prefetch_used"] += 1
@@ -6,3 +6,10 @@ LLM_MODEL = config("LLM_MODEL", default="qwen3")
 LLM_TEMPERATURE = config("LLM_TEMPERATURE", default=0.0, cast=float)
 OLLAMA_BASE_URL = config("OLLAMA_BASE_URL", default="http://localhost:11434/v1")
 LLM_API_KEY = config("LLM_API_KEY", default="ollama")
+LLM_PREFIX_CACHE = config("LLM_PREFIX_CACHE", default=False, cast=bool)
+OLLAMA_KEEP_ALIVE = config("OLLAMA_KEEP_ALIVE", default="30m")
+WEATHER_CACHE_TTL_S = config("WEATHER_CACHE_TTL_S", default=600, cast=int)
+WEATHER_PREFETCH = config("WEATHER_PREFETCH", default=False, cast=bool)
+WEATHER_CACHE_BACKEND = config("WEATHER_CACHE_BACKEND", default="memory")
+WEATHER_CACHE_PATH = config("WEATHER_CACHE_PATH", default=".cache/weather.sqlite3")
+DIGEST_STORE_PATH = config("DIGEST_STORE_PATH", default=".cache/digests.sqlite3")
@@ -0,0 +1,148 @@
+"""Multi-process deployment: several Streamlit workers sharing one weather cache.
+
+Start it from the inner ``weather-chatbot`` folder::
+
+    python -m core.deploy --workers 4
+
+Each worker is a separate Streamlit process listening on ``--host`` at its own
+port, and all of them share the weather cache through a SQLite database in WAL
+mode. The router on ``--router-port`` is only an entry point: it gives each
+browser a ``wc_session`` cookie and redirects (HTTP 302) to the worker picked by
+hashing that id, so a browser entering through the router always reaches the
+same worker.
+
+The router does not proxy traffic. Worker ports must be reachable by clients,
+and a bookmarked worker URL bypasses the sharding. Streamlit keeps
+``st.session_state`` per websocket connection, so chat history is lost on page
+reload whichever worker serves it; the sticky assignment spreads sessions across
+processes but does not preserve conversations. In production, put a reverse
+proxy with websocket support in front of the workers instead, e.g. nginx with
+``hash $cookie_wc_session consistent;``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import os
+import signal
+import subprocess
+import sys
+import uuid
+from http import cookies
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import List, Sequence
+
+from core.config import WEATHER_CACHE_PATH
+
+APP_DIR = Path(__file__).resolve().parent.parent
+SESSION_COOKIE = "wc_session"
+
+
+def shard_for(session_id: str, workers: int) -> int:
+    """Pick a worker index for a session using rendezvous hashing.
+
+    The mapping is stable across processes and restarts, and changing the
+    worker count only moves the sessions owned by added or removed workers.
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+
+    def weight(index: int) -> bytes:
+        return hashlib.blake2b(
+            f"{session_id}:{index}".encode("utf-8"), digest_size=8
+        ).digest()
+
+    return max(range(workers), key=weight)
+
+
+def _make_router(host: str, ports: Sequence[int]):
+    class SessionRouter(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            jar = cookies.SimpleCookie(self.headers.get("Cookie", ""))
+            morsel = jar.get(SESSION_COOKIE)
+            session_id = morsel.value if morsel else uuid.uuid4().hex
+
+            port = ports[shard_for(session_id, len(ports))]
+            target_host = (self.headers.get("Host") or host).split(":")[0]
+
+            self.send_response(302)
+            self.send_header("Location", f"http://{target_host}:{port}{self.path}")
+            if morsel is None:
+                self.send_header(
+                    "Set-Cookie", f"{SESSION_COOKIE}={session_id}; Path=/; HttpOnly"
+                )
+            self.end_headers()
+
+        def log_message(self, format: str, *args) -> None:
+            return
+
+    return SessionRouter
+
+
+def _start_workers(
+    workers: int, host: str, base_port: int, cache_path: Path
+) -> List[subprocess.Popen]:
+    env = dict(os.environ)
+    env["WEATHER_CACHE_BACKEND"] = "sqlite"
+    env["WEATHER_CACHE_PATH"] = str(cache_path)
+
+    processes = []
+    for index in range(workers):
+        processes.append(
+            subprocess.Popen(
+                [
+                    sys.executable,
+                    "-m",
+                    "streamlit",
+                    "run",
+                    "app_streamlit.py",
+                    "--server.address",
+                    host,
+                    "--server.port",
+                    str(base_port + index),
+                    "--server.headless",
+                    "true",
+                ],
+                cwd=APP_DIR,
+                env=env,
+            )
+        )
+    return processes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run session-sharded Streamlit workers")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--router-port", type=int, default=8500)
+    parser.add_argument("--base-port", type=int, default=8501)
+    parser.add_argument("--cache-path", type=Path, default=Path(WEATHER_CACHE_PATH))
+    args = parser.parse_args()
+
+    cache_path = args.cache_path
+    if not cache_path.is_absolute():
+        cache_path = APP_DIR / cache_path
+
+    processes = _start_workers(args.workers, args.host, args.base_port, cache_path)
+    ports = [args.base_port + i for i in range(args.workers)]
+    server = ThreadingHTTPServer(
+        (args.host, args.router_port), _make_router(args.host, ports)
+    )
+    print(f"Router on http://{args.host}:{args.router_port} -> workers {ports}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        for proc in processes:
+            proc.send_signal(signal.SIGTERM)
+        for proc in processes:
+            proc.wait()
+
+
+if __name__ == "__main__":
+    main()
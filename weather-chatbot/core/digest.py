@@ -0,0 +1,263 @@
+"""Precomputed daily forecast digests for subscribed locations.
+
+Build today's digests from the inner ``weather-chatbot`` folder::
+
+    python -m core.digest subscriptions.json
+
+``subscriptions.json`` is a list of ``{"location": "Madrid", "language": "es"}``
+objects. Forecasts are fetched with bounded concurrency, summaries are generated
+with ``Runnable.batch`` (concurrent LLM requests, also bounded), and results are
+stored by (location, language, date). Dates are the location's local date, both
+when storing and when looking up. The agent answers matching "forecast for
+<city> today" questions from the store without calling the tools or the LLM.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from core.agent.prefetch import guess_weather_requests
+from core.agent.tools import forecast_weather
+from core.config import DIGEST_STORE_PATH
+
+LANGUAGE_NAMES = {"en": "English", "es": "Spanish"}
+
+DIGEST_SYSTEM_PROMPT = (
+    "You are a weather assistant writing a short morning briefing from the "
+    "forecast data provided. Use Celsius, wind in kph and humidity percent, and "
+    "mention the air quality metrics. Be friendly and concise."
+)
+
+_TODAY_WORDS = {"en": re.compile(r"\btoday\b", re.I), "es": re.compile(r"\bhoy\b", re.I)}
+_FORECAST_WORD_RE = re.compile(
+    r"\b(?:weather|forecast|tiempo|clima|pron[oó]stico|previsi[oó]n)\b", re.IGNORECASE
+)
+# Anything that points at another time, current conditions or a negated "today".
+_NOT_DIGEST_RE = re.compile(
+    r"\b(?:now|right now|currently|current|tomorrow|yesterday|tonight|"
+    r"overnight|this (?:afternoon|evening)|(?:in|during) the (?:afternoon|evening|night)|"
+    r"week|weekend|next|ahora|actual|actualmente|ayer|esta noche|esta tarde|"
+    r"de noche|de tarde|(?:por|en|durante) la (?:noche|tarde)|semana|"
+    r"fin de semana|pr[oó]xim[oa]s?)\b"
+    r"|(?<!esta\s)\bma[nñ]ana\b"
+    r"|\b(?:not|no)\s+(?:for\s+|para\s+)?(?:today|hoy)\b"
+    r"|\b(?:[2-9]|10)\s*[- ]?\s*(?:days?|d[ií]as?)\b",
+    re.IGNORECASE,
+)
+# A second place joined to the matched city ("Madrid and Barcelona", "Madrid y
+# Sevilla", "Madrid today compared to Barcelona") means a multi-city question.
+_JOINED_PLACE_RE = re.compile(
+    r"[,/&]|\b(?:and|or|vs|versus|compared\s+(?:to|with)|y|o|e|u|"
+    r"comparad[oa]\s+con|frente\s+a)\b",
+    re.IGNORECASE,
+)
+
+
+@dataclass(frozen=True)
+class Subscription:
+    location: str
+    language: str
+
+
+def normalize_location(location: str) -> str:
+    return " ".join(location.split()).casefold()
+
+
+def local_date(tz_id: Optional[str], now: Optional[datetime] = None) -> str:
+    """Today's date in ``tz_id``, falling back to the server date."""
+    now = now or datetime.now(timezone.utc)
+    if tz_id:
+        try:
+            return now.astimezone(ZoneInfo(tz_id)).date().isoformat()
+        except (ZoneInfoNotFoundError, ValueError):
+            pass
+    return now.astimezone().date().isoformat()
+
+
+class DigestStore:
+    """SQLite store of digests indexed by (location, language, date)."""
+
+    def __init__(self, path: str | Path) -> None:
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS digests ("
+            "location TEXT NOT NULL, language TEXT NOT NULL, date TEXT NOT NULL, "
+            "tz_id TEXT, summary TEXT NOT NULL, created REAL NOT NULL, "
+            "PRIMARY KEY (location, language, date)"
+            ") WITHOUT ROWID"
+        )
+        conn.commit()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self._path, timeout=5.0)
+            self._local.conn = conn
+        return conn
+
+    def put_many(
+        self, rows: Iterable[Tuple[str, str, str, Optional[str], str]]
+    ) -> int:
+        """Store ``(location, language, local_date, tz_id, summary)`` rows."""
+        now = time.time()
+        values = [
+            (normalize_location(location), language, day, tz_id, summary, now)
+            for location, language, day, tz_id, summary in rows
+        ]
+        conn = self._connect()
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO digests "
+                "(location, language, date, tz_id, summary, created) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                values,
+            )
+        return len(values)
+
+    def get(self, location: str, day: str, language: str) -> Optional[str]:
+        row = (
+            self._connect()
+            .execute(
+                "SELECT summary FROM digests "
+                "WHERE location = ? AND date = ? AND language = ?",
+                (normalize_location(location), day, language),
+            )
+            .fetchone()
+        )
+        return row[0] if row else None
+
+    def get_today(
+        self, location: str, language: str, now: Optional[datetime] = None
+    ) -> Optional[str]:
+        """Return the digest whose date is today in the location's own time zone."""
+        rows = (
+            self._connect()
+            .execute(
+                "SELECT date, tz_id, summary FROM digests "
+                "WHERE location = ? AND language = ? ORDER BY date DESC LIMIT 3",
+                (normalize_location(location), language),
+            )
+            .fetchall()
+        )
+        for day, tz_id, summary in rows:
+            if day == local_date(tz_id, now):
+                return summary
+        return None
+
+    def answer(self, user_input: str, now: Optional[datetime] = None) -> Optional[str]:
+        """Return a stored digest if the question is a plain "today" forecast."""
+        query = match_digest_query(user_input)
+        if query is None:
+            return None
+        location, language = query
+        return self.get_today(location, language, now)
+
+
+def match_digest_query(text: str) -> Optional[Tuple[str, str]]:
+    """Detect "forecast for <city> today" questions and their language."""
+    if _NOT_DIGEST_RE.search(text) or not _FORECAST_WORD_RE.search(text):
+        return None
+    languages = [lang for lang, pattern in _TODAY_WORDS.items() if pattern.search(text)]
+    guesses = guess_weather_requests(text)
+    if len(languages) != 1 or len(guesses) != 1:
+        return None
+    city = guesses[0].city
+    if _JOINED_PLACE_RE.search(text, text.find(city) + len(city)):
+        return None
+    return city, languages[0]
+
+
+def fetch_forecasts(
+    locations: Sequence[str], max_concurrency: int = 4
+) -> Dict[str, Dict[str, Any]]:
+    unique = list(dict.fromkeys(locations))
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        results = executor.map(lambda city: forecast_weather(city, days=1), unique)
+        return dict(zip(unique, results))
+
+
+def _digest_prompt(subscription: Subscription, forecast: Dict[str, Any]):
+    from langchain_core.messages import HumanMessage, SystemMessage
+
+    language = LANGUAGE_NAMES.get(subscription.language, subscription.language)
+    return [
+        SystemMessage(content=DIGEST_SYSTEM_PROMPT),
+        HumanMessage(
+            content=(
+                f"Write today's forecast briefing for {subscription.location} "
+                f"in {language} from this forecast data:\n"
+                + json.dumps(forecast, ensure_ascii=False)
+            )
+        ),
+    ]
+
+
+def build_daily_digests(
+    subscriptions: Sequence[Subscription],
+    store: DigestStore,
+    max_concurrency: int = 4,
+) -> int:
+    """Fetch, summarize and store today's digests; returns how many were stored.
+
+    A failed forecast or LLM request only skips that subscription.
+    """
+    from core.agent.agent import _build_model
+
+    forecasts = fetch_forecasts([s.location for s in subscriptions], max_concurrency)
+
+    pending: List[Tuple[Subscription, str, Optional[str]]] = []
+    prompts = []
+    for subscription in subscriptions:
+        forecast = forecasts[subscription.location]
+        days = forecast.get("forecast") or []
+        if "error" in forecast or not days:
+            continue
+        tz_id = (forecast.get("location") or {}).get("tz_id")
+        pending.append((subscription, days[0]["date"], tz_id))
+        prompts.append(_digest_prompt(subscription, forecast))
+
+    if not prompts:
+        return 0
+
+    responses = _build_model().batch(
+        prompts, config={"max_concurrency": max_concurrency}, return_exceptions=True
+    )
+    return store.put_many(
+        (subscription.location, subscription.language, day, tz_id, response.content)
+        for (subscription, day, tz_id), response in zip(pending, responses)
+        if not isinstance(response, Exception) and response.content
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build today's weather digests")
+    parser.add_argument("subscriptions", type=Path, help="JSON list of subscriptions")
+    parser.add_argument("--store", type=Path, default=Path(DIGEST_STORE_PATH))
+    parser.add_argument("--max-concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    raw = json.loads(args.subscriptions.read_text(encoding="utf-8"))
+    subscriptions = [Subscription(item["location"], item["language"]) for item in raw]
+    stored = build_daily_digests(
+        subscriptions, DigestStore(args.store), args.max_concurrency
+    )
+    print(f"Stored {stored} of {len(subscriptions)} digests in {args.store}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+
+from core.cache import (
+    MemoryCacheBackend,
+    SQLiteCacheBackend,
+    WeatherCache,
+    decode_payload,
+    encode_payload,
+    weather_cache_key,
+)
+
+
+def _key(city: str = "Madrid"):
+    return weather_cache_key("current", {"q": city})
+
+
+def test_key_normalizes_city_case_and_whitespace():
+    assert _key("  new   York ") == _key("New York")
+
+
+def test_concurrent_lookups_share_one_fetch():
+    cache = WeatherCache(ttl_s=60)
+    calls = []
+    release = threading.Event()
+
+    def fetch():
+        calls.append(1)
+        release.wait(1)
+        return {"temp_c": 20}
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_or_fetch(_key(), fetch)))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [{"temp_c": 20}] * 4
+
+
+def test_errors_are_not_cached():
+    cache = WeatherCache(ttl_s=60)
+    cache.get_or_fetch(_key(), lambda: {"error": "boom"})
+    assert cache.get_or_fetch(_key(), lambda: {"temp_c": 1}) == {"temp_c": 1}
+
+
+def test_entries_expire_after_ttl():
+    cache = WeatherCache(ttl_s=0.01)
+    cache.get_or_fetch(_key(), lambda: {"temp_c": 1})
+    time.sleep(0.02)
+    assert cache.get_or_fetch(_key(), lambda: {"temp_c": 2}) == {"temp_c": 2}
+
+
+def test_consumed_prefetch_counts_as_used():
+    cache = WeatherCache(ttl_s=60)
+    assert cache.begin_speculative(_key())
+    cache.get_or_fetch(_key(), lambda: {"temp_c": 1}, speculative=True)
+    cache.get_or_fetch(_key(), lambda: {"temp_c": 2})
+
+    assert cache.settle_speculative([_key()]) == 0
+    stats = cache.stats()
+    assert (stats["prefetch_started"], stats["prefetch_used"]) == (1, 1)
+
+
+def test_prefetch_settled_before_it_runs_counts_as_wasted():
+    cache = WeatherCache(ttl_s=60)
+    assert cache.begin_speculative(_key())
+    assert cache.settle_speculative([_key()]) == 1
+
+    # The late prefetch and a later real lookup must not count as "used".
+    cache.get_or_fetch(_key(), lambda: {"temp_c": 1}, speculative=True)
+    cache.get_or_fetch(_key(), lambda: {"temp_c": 2})
+
+    stats = cache.stats()
+    assert (stats["prefetch_used"], stats["prefetch_wasted"]) == (0, 1)
+
+
+def test_no_prefetch_registered_for_cached_data():
+    cache = WeatherCache(ttl_s=60)
+    cache.get_or_fetch(_key(), lambda: {"temp_c": 1})
+    assert not cache.begin_speculative(_key())
+    assert cache.stats()["prefetch_started"] == 0
+
+
+def test_sqlite_backend_is_shared_between_instances(tmp_path):
+    path = tmp_path / "weather.sqlite3"
+    first = WeatherCache(ttl_s=60, backend=SQLiteCacheBackend(path))
+    second = WeatherCache(ttl_s=60, backend=SQLiteCacheBackend(path))
+
+    payload = {"location": {"name": "Cádiz"}, "temp_c": 21.5}
+    first.get_or_fetch(_key(), lambda: payload)
+
+    assert second.get_or_fetch(_key(), lambda: {"temp_c": 0}) == payload
+    assert second.stats()["hits"] == 1
+
+
+def test_sqlite_backend_expires_entries(tmp_path):
+    backend = SQLiteCacheBackend(tmp_path / "weather.sqlite3")
+    backend.set(_key(), {"temp_c": 1}, ttl_s=-1)
+    assert backend.get(_key()) is None
+
+
+def test_payload_encoding_round_trips():
+    payload = {"forecast": [{"date": "2026-01-01", "temperature_c": 12.5}], "city": "Málaga"}
+    assert decode_payload(encode_payload(payload)) == payload
+
+
+def test_data_stored_during_lookup_is_not_fetched_twice():
+    backend = MemoryCacheBackend()
+    cache = WeatherCache(ttl_s=60, backend=backend)
+    fetches = []
+    original_get = backend.get
+    raced = []
+
+    def get(key):
+        result = original_get(key)
+        if not raced:
+            # Another thread completes a fetch right after this lookup misses.
+            raced.append(True)
+            other = threading.Thread(
+                target=cache.get_or_fetch,
+                args=(key, lambda: fetches.append("other") or {"temp_c": 1}),
+            )
+            other.start()
+            other.join()
+        return result
+
+    backend.get = get
+    assert cache.get_or_fetch(_key(), lambda: fetches.append("mine") or {"temp_c": 2}) == {
+        "temp_c": 1
+    }
+    assert fetches == ["other"]
+
+
+def test_slow_backend_recheck_does_not_block_other_keys():
+    backend = MemoryCacheBackend()
+    cache = WeatherCache(ttl_s=60, backend=backend)
+    original_get = backend.get
+    calls = {"Madrid": 0}
+    in_recheck = threading.Event()
+    release = threading.Event()
+
+    def get(key):
+        if key == _key("Madrid"):
+            calls["Madrid"] += 1
+            if calls["Madrid"] == 2:
+                in_recheck.set()
+                release.wait(2)
+        return original_get(key)
+
+    backend.get = get
+    slow = threading.Thread(target=cache.get_or_fetch, args=(_key("Madrid"), lambda: {"t": 1}))
+    slow.start()
+    assert in_recheck.wait(1)
+
+    done = []
+    other = threading.Thread(
+        target=lambda: done.append(cache.get_or_fetch(_key("Lisbon"), lambda: {"t": 2}))
+    )
+    other.start()
+    other.join(1)
+    try:
+        assert done == [{"t": 2}]
+    finally:
+        release.set()
+        slow.join()
+
+
+def test_sqlite_backend_treats_corrupt_rows_as_misses(tmp_path):
+    path = tmp_path / "weather.sqlite3"
+    backend = SQLiteCacheBackend(path)
+    backend.set(_key(), {"temp_c": 1}, ttl_s=60)
+
+    conn = sqlite3.connect(path)
+    with conn:
+        conn.execute("UPDATE weather_cache SET payload = ?", (b"not zlib",))
+    conn.close()
+
+    assert backend.get(_key()) is None
+    cache = WeatherCache(ttl_s=60, backend=backend)
+    assert cache.get_or_fetch(_key(), lambda: {"temp_c": 2}) == {"temp_c": 2}
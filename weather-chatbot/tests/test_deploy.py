@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from collections import Counter
+
+import pytest
+
+from core.deploy import shard_for
+
+SESSIONS = [f"session-{i}" for i in range(2000)]
+
+
+def test_shard_is_stable_and_in_range():
+    for session_id in SESSIONS[:50]:
+        shard = shard_for(session_id, 4)
+        assert 0 <= shard < 4
+        assert shard_for(session_id, 4) == shard
+
+
+def test_sessions_spread_across_workers():
+    counts = Counter(shard_for(session_id, 4) for session_id in SESSIONS)
+    assert set(counts) == {0, 1, 2, 3}
+    assert min(counts.values()) > len(SESSIONS) / 4 * 0.8
+
+
+def test_adding_a_worker_only_moves_sessions_to_it():
+    for session_id in SESSIONS:
+        before, after = shard_for(session_id, 4), shard_for(session_id, 5)
+        assert after in (before, 4)
+
+
+def test_rejects_zero_workers():
+    with pytest.raises(ValueError):
+        shard_for("abc", 0)
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import pytest
+
+from core import digest
+from core.digest import DigestStore, Subscription, build_daily_digests, match_digest_query
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Forecast for Madrid today", ("Madrid", "en")),
+        ("What's the weather in Madrid today?", ("Madrid", "en")),
+        ("¿Qué tiempo hace hoy en Sevilla?", ("Sevilla", "es")),
+        ("¿Qué tiempo hará esta mañana en Sevilla? Hoy", ("Sevilla", "es")),
+    ],
+)
+def test_matches_plain_today_forecast_questions(text, expected):
+    assert match_digest_query(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "Will it rain tomorrow in Madrid? and today?",
+        "What was the weather in Madrid yesterday, not today",
+        "What's the weather for tonight in Madrid? Not today",
+        "¿Qué tiempo hará mañana en Madrid? ¿y hoy?",
+        "What is the weather in Madrid right now? today",
+        "5 day forecast for Madrid today",
+        "forecast for Madrid",
+        "Who is playing in Madrid today?",
+        "Weather today in Madrid or in Paris?",
+        "Weather in Madrid and Barcelona today",
+        "¿Qué tiempo hace hoy en Madrid y Sevilla?",
+        "How's the weather in Madrid today compared to Barcelona?",
+        "Weather in Madrid vs Barcelona today",
+        "Weather in Madrid, Barcelona today",
+        "Weather in Madrid/Barcelona today",
+        "¿Qué tiempo hace hoy en Madrid o Sevilla?",
+        "¿Qué tiempo hace hoy en Madrid de noche?",
+        "¿Qué tiempo hará hoy en Madrid por la tarde?",
+        "¿Qué tiempo hace hoy en Madrid esta tarde?",
+        "What's the weather in Madrid this evening? today",
+        "Weather in Madrid today overnight",
+    ],
+)
+def test_rejects_questions_not_about_today(text):
+    assert match_digest_query(text) is None
+
+
+def test_lookup_uses_the_locations_local_date(tmp_path):
+    store = DigestStore(tmp_path / "digests.sqlite3")
+    store.put_many([("Tokyo", "en", "2026-03-02", "Asia/Tokyo", "Sunny in Tokyo")])
+
+    # 20:00 UTC on March 1st is already March 2nd in Tokyo.
+    now = datetime(2026, 3, 1, 20, 0, tzinfo=timezone.utc)
+    assert store.answer("Forecast for Tokyo today", now=now) == "Sunny in Tokyo"
+
+    earlier = datetime(2026, 3, 1, 10, 0, tzinfo=timezone.utc)
+    assert store.answer("Forecast for Tokyo today", now=earlier) is None
+
+
+def test_lookup_normalizes_location(tmp_path):
+    store = DigestStore(tmp_path / "digests.sqlite3")
+    store.put_many([("  madrid ", "es", "2026-03-01", "Europe/Madrid", "Soleado")])
+    now = datetime(2026, 3, 1, 9, 0, tzinfo=timezone.utc)
+    assert store.get_today("Madrid", "es", now=now) == "Soleado"
+    assert store.get_today("Madrid", "en", now=now) is None
+
+
+class _Reply:
+    def __init__(self, content: str) -> None:
+        self.content = content
+
+
+class _FakeModel:
+    def __init__(self, outputs):
+        self._outputs = outputs
+        self.calls = []
+
+    def batch(self, prompts, config=None, return_exceptions=False):
+        self.calls.append((len(prompts), config, return_exceptions))
+        if not return_exceptions and any(isinstance(o, Exception) for o in self._outputs):
+            raise next(o for o in self._outputs if isinstance(o, Exception))
+        return list(self._outputs)
+
+
+def _forecast(city: str, days: int = 1):
+    if city == "Nowhere":
+        return {"error": "No matching location found."}
+    return {
+        "location": {"name": city, "tz_id": "Europe/Madrid"},
+        "days": days,
+        "forecast": [{"date": "2026-03-01", "temperature_c": 14.0}],
+    }
+
+
+def test_pipeline_skips_failed_forecasts_and_llm_calls(tmp_path, monkeypatch):
+    pytest.importorskip("langchain_core")
+    from core.agent import agent
+
+    model = _FakeModel([_Reply("Madrid briefing"), RuntimeError("timeout")])
+    monkeypatch.setattr(digest, "forecast_weather", _forecast)
+    monkeypatch.setattr(agent, "_build_model", lambda: model)
+
+    store = DigestStore(tmp_path / "digests.sqlite3")
+    subscriptions = [
+        Subscription("Madrid", "en"),
+        Subscription("Valencia", "es"),
+        Subscription("Nowhere", "en"),
+    ]
+    assert build_daily_digests(subscriptions, store, max_concurrency=2) == 1
+
+    assert model.calls == [(2, {"max_concurrency": 2}, True)]
+    assert store.get("Madrid", "2026-03-01", "en") == "Madrid briefing"
+    assert store.get("Valencia", "2026-03-01", "es") is None
+
+
+def test_agent_serves_digests_once_the_store_appears(tmp_path, monkeypatch):
+    pytest.importorskip("langchain_core")
+    import asyncio
+
+    from core.agent.agent import WeatherAgent
+
+    path = tmp_path / "digests.sqlite3"
+    agent = WeatherAgent(graph=None, digest_path=str(path))
+    assert agent._answer_from_digest("Forecast for Madrid today") is None
+
+    today = digest.local_date("Europe/Madrid")
+    DigestStore(path).put_many([("Madrid", "en", today, "Europe/Madrid", "Mild and sunny")])
+
+    new_messages, text = asyncio.run(agent._run("Forecast for Madrid today", []))
+    assert text == "Mild and sunny"
+    assert [m.content for m in new_messages] == ["Mild and sunny"]
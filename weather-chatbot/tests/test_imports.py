@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+APP_DIR = Path(__file__).resolve().parent.parent
+
+_CHECK_LIGHT_IMPORTS = """
+import json, sys
+import core.agent, core.agent.tools, core.cache, core.deploy, core.digest
+heavy = sorted(
+    name for name in sys.modules
+    if name.split(".")[0].startswith(("langchain", "langgraph"))
+)
+print(json.dumps(heavy))
+"""
+
+
+def _run(code: str) -> str:
+    completed = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=APP_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return completed.stdout.strip().splitlines()[-1]
+
+
+def test_tool_layer_imports_without_langchain():
+    assert json.loads(_run(_CHECK_LIGHT_IMPORTS)) == []
+
+
+def test_build_agent_still_resolves_lazily():
+    pytest.importorskip("langgraph")
+    code = "from core.agent import build_agent, WeatherAgent; print(build_agent.__module__)"
+    assert _run(code) == "core.agent.agent"
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import pytest
+
+from core.agent.prefetch import PrefetchGuess, guess_weather_requests
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("What is the current weather in Madrid?", [PrefetchGuess("Madrid", None)]),
+        ("Give me the 3 day forecast for Barcelona.", [PrefetchGuess("Barcelona", 3)]),
+        ("Forecast for Sevilla", [PrefetchGuess("Sevilla", 3)]),
+        (
+            "El pronóstico de 5 días para Las Palmas de Gran Canaria",
+            [PrefetchGuess("Las Palmas de Gran Canaria", 5)],
+        ),
+        (
+            "¿Qué tiempo hará mañana en San Sebastián?",
+            [PrefetchGuess("San Sebastián", 3)],
+        ),
+    ],
+)
+def test_guesses_city_and_horizon(text, expected):
+    assert guess_weather_requests(text) == expected
+
+
+@pytest.mark.parametrize(
+    "text",
+    ["Who won in France?", "history of Rome in The Middle Ages", "hello"],
+)
+def test_off_topic_messages_are_not_prefetched(text):
+    assert guess_weather_requests(text) == []
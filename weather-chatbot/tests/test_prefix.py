@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import pytest
+
+pytest.importorskip("langchain_core")
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage  # noqa: E402
+
+from core.agent.prefix import PrefixCacheStats, ollama_native_url, turn_step  # noqa: E402
+
+
+def test_turn_step_counts_assistant_messages_since_last_user_message():
+    history = [HumanMessage(content="hi"), AIMessage(content="hello")]
+    assert turn_step(history + [HumanMessage(content="weather in Madrid?")]) == 1
+
+    tool_call = AIMessage(
+        content="", tool_calls=[{"name": "current_weather", "args": {"city": "Madrid"}, "id": "1"}]
+    )
+    turn = history + [
+        HumanMessage(content="weather in Madrid?"),
+        tool_call,
+        ToolMessage(content="{}", tool_call_id="1"),
+    ]
+    assert turn_step(turn) == 2
+
+
+def test_summary_reports_none_when_server_does_not_report_timings():
+    stats = PrefixCacheStats()
+    response = AIMessage(
+        content="ok",
+        usage_metadata={"input_tokens": 100, "output_tokens": 5, "total_tokens": 105},
+    )
+    stats.record(2, 0.5, response)
+
+    summary = stats.summary()[2]
+    assert summary["avg_prefill_s"] is None
+    assert summary["cache_reuse"] is None
+
+
+def test_summary_reports_reuse_and_prefill_when_available():
+    stats = PrefixCacheStats()
+    response = AIMessage(
+        content="ok",
+        usage_metadata={
+            "input_tokens": 100,
+            "output_tokens": 5,
+            "total_tokens": 105,
+            "input_token_details": {"cache_read": 80},
+        },
+        response_metadata={"prompt_eval_duration": 250_000_000},
+    )
+    stats.record(2, 0.5, response)
+
+    summary = stats.summary()[2]
+    assert summary["avg_prefill_s"] == pytest.approx(0.25)
+    assert summary["cache_reuse"] == pytest.approx(0.8)
+
+
+def test_ollama_native_url_strips_openai_suffix():
+    assert ollama_native_url("http://localhost:11434/v1") == "http://localhost:11434"
+    assert ollama_native_url("http://localhost:11434/v1/") == "http://localhost:11434"
+    assert ollama_native_url("http://localhost:11434") == "http://localhost:11434"
+
+
+def test_prefix_cache_mode_uses_native_ollama_api_with_keep_alive():
+    pytest.importorskip("langchain_ollama")
+    from core.agent.agent import _build_model
+    from core.config import OLLAMA_BASE_URL, OLLAMA_KEEP_ALIVE
+
+    model = _build_model(prefix_cache=True)
+    assert type(model).__name__ == "ChatOllama"
+    assert model.keep_alive == OLLAMA_KEEP_ALIVE
+    assert model.base_url == ollama_native_url(OLLAMA_BASE_URL)
+
+    assert type(_build_model()).__name__ == "ChatOpenAI"